@@ -1,68 +1,177 @@
 """ Handles high-level operations on the board """
-from dataclasses import dataclass
-from enum import Enum
-
 BOARD_ROWS    = 7
 BOARD_COLUMNS = 7
 
 
-class Direction(Enum):
+class Direction:
+    """ Move directions - plain ints, so they can index lookup tables directly """
     UP = 0
     RIGHT = 1
     DOWN = 2
     LEFT = 3
 
+    NAMES = ("UP", "RIGHT", "DOWN", "LEFT")
+
+
+def _is_valid_coords(row_index: int, column_index: int) -> bool:
+    """ Checks whether (row, column) falls on the cross-shaped board """
+    if row_index < 0 or row_index >= BOARD_ROWS or \
+       column_index < 0 or column_index >= BOARD_COLUMNS:
+        return False
+    return 2 <= row_index < 5 or 2 <= column_index < 5
+
+
+# (jump_row, jump_column, target_row, target_column) offsets, indexed by direction
+DELTAS = (
+    (-1,  0, -2,  0),  # UP
+    ( 0,  1,  0,  2),  # RIGHT
+    ( 1,  0,  2,  0),  # DOWN
+    ( 0, -1,  0, -2),  # LEFT
+)
+
+
+def _generate_jump_and_target_coords(row_index: int,
+                                     column_index: int,
+                                     direction: int):
+    jump_row, jump_column, target_row, target_column = DELTAS[direction]
+    jump_coords   = (row_index + jump_row,   column_index + jump_column)
+    target_coords = (row_index + target_row, column_index + target_column)
+
+    return (jump_coords, target_coords, direction)
+
 
-@dataclass
-class PegPosition:
-    """ Peg manager """
-    peg_present: bool
-    is_empty: bool
-    is_valid_position: bool
-
-    def __init__(self, peg_present: bool | None=None):
-        if peg_present is None:
-            self.peg_present = False
-            self.is_empty = False
-            self.is_valid_position = False
-        else:
-            self.peg_present = peg_present
-            self.is_empty = not peg_present
-            self.is_valid_position = True
-
-    def add_peg(self):
-        """ Add a peg to a valid position """
-        if not self.is_valid_position:
-            raise ValueError("Not a valid location for a peg")
-        if not self.is_empty:
-            raise ValueError("Peg already present in this location - can't add")
-        self.peg_present = True
-        self.is_empty = False
-
-    def remove_peg(self):
-        """ Remove a peg from a valid position """
-        if not self.is_valid_position:
-            raise ValueError("Not a valid location for a peg")
-        if not self.peg_present:
-            raise ValueError("Peg not present in this location - can't remove")
-        self.peg_present = False
-        self.is_empty = True
-
-    def as_char(self) -> str:
-        """ Return character map for peg - useful when printing board """
-        if not self.is_valid_position:
-            return "  "
-        elif self.peg_present:
-            return " *"
-        else:
-            return " O"
+# Assign each valid position a bit index in the bitboard (row-major order)
+CELL_INDEX = {}
+CELL_COORDS = []
+for _row_index in range(BOARD_ROWS):
+    for _column_index in range(BOARD_COLUMNS):
+        if _is_valid_coords(_row_index, _column_index):
+            CELL_INDEX[(_row_index, _column_index)] = len(CELL_COORDS)
+            CELL_COORDS.append((_row_index, _column_index))
+
+CENTER_INDEX = CELL_INDEX[(3, 3)]
+
+# Bit for each position, row by row - None where there is no position
+ROW_BITS = tuple(tuple(1 << CELL_INDEX[(row_index, column_index)]
+                       if (row_index, column_index) in CELL_INDEX else None
+                       for column_index in range(BOARD_COLUMNS))
+                 for row_index in range(BOARD_ROWS))
+
+
+def _generate_moves():
+    """
+    Build the table of every move that stays on the board as
+    (need_set, need_clear, xor_mask, origin_index, direction).
+    A move is legal when all of need_set (origin and jump) hold pegs and
+    need_clear (target) is empty; xor_mask flips all three to make it
+    """
+    moves = []
+    for origin_index, (row_index, column_index) in enumerate(CELL_COORDS):
+        for direction in range(len(DELTAS)):
+            jump_coords, target_coords, _ = \
+                _generate_jump_and_target_coords(row_index, column_index, direction)
+            if jump_coords not in CELL_INDEX or target_coords not in CELL_INDEX:
+                continue
+            origin_bit = 1 << origin_index
+            jump_bit   = 1 << CELL_INDEX[jump_coords]
+            target_bit = 1 << CELL_INDEX[target_coords]
+            moves.append((origin_bit | jump_bit,
+                          target_bit,
+                          origin_bit | jump_bit | target_bit,
+                          origin_index,
+                          direction))
+
+    # Try moves from the tips of the arms first - pegs stranded out there
+    # are the usual dead end, so clearing them early finds solutions with
+    # far less search. Ties keep row-major order
+    def _origin_distance(move):
+        row_index, column_index = CELL_COORDS[move[3]]
+        return abs(row_index - 3) + abs(column_index - 3)
+
+    return tuple(sorted(moves, key=_origin_distance, reverse=True))
+
+
+# All 76 geometrically possible moves, and a reverse lookup into them
+MOVES = _generate_moves()
+MOVE_INDEX = {(origin_index, direction): move_index
+              for move_index, (_, _, _, origin_index, direction) in enumerate(MOVES)}
+
+
+def find_move(row_index: int, column_index: int, direction: int) -> int:
+    """ Gets the index into MOVES for moving the peg at (row, column) in direction """
+    move_index = MOVE_INDEX.get((CELL_INDEX.get((row_index, column_index)), direction))
+    if move_index is None:
+        raise ValueError("Move leaves the board")
+    return move_index
+
+
+def describe_move(move_index: int):
+    """ Returns (row_index, column_index, direction) for an index into MOVES """
+    _, _, _, origin_index, direction = MOVES[move_index]
+    row_index, column_index = CELL_COORDS[origin_index]
+    return (row_index, column_index, direction)
+
+
+# The 8 rotations/reflections of the board, as (row, column) -> (row, column)
+SYMMETRIES = (
+    lambda row_index, column_index: (row_index, column_index),
+    lambda row_index, column_index: (column_index, 6 - row_index),
+    lambda row_index, column_index: (6 - row_index, 6 - column_index),
+    lambda row_index, column_index: (6 - column_index, row_index),
+    lambda row_index, column_index: (row_index, 6 - column_index),
+    lambda row_index, column_index: (6 - row_index, column_index),
+    lambda row_index, column_index: (column_index, row_index),
+    lambda row_index, column_index: (6 - column_index, 6 - row_index),
+)
+
+
+def _generate_symmetry_tables():
+    """
+    For each symmetry, build one 256-entry table per byte of the bitboard
+    mapping that byte's pegs to their transformed bits. A whole board is
+    then transformed by OR-ing five table lookups
+    """
+    tables = []
+    for symmetry in SYMMETRIES:
+        cell_map = [CELL_INDEX[symmetry(row_index, column_index)]
+                    for row_index, column_index in CELL_COORDS]
+        byte_tables = []
+        for byte_index in range(5):
+            table = []
+            for value in range(256):
+                image = 0
+                for bit_index in range(8):
+                    cell_index = byte_index * 8 + bit_index
+                    if value & (1 << bit_index) and cell_index < len(CELL_COORDS):
+                        image |= 1 << cell_map[cell_index]
+                table.append(image)
+            byte_tables.append(tuple(table))
+        tables.append(tuple(byte_tables))
+    return tuple(tables)
+
+
+SYMMETRY_TABLES = _generate_symmetry_tables()
+
+
+def canonical_pegs(pegs: int) -> int:
+    """ Smallest bitboard among the 8 symmetric images of pegs """
+    byte_0 =  pegs        & 0xFF
+    byte_1 = (pegs >> 8)  & 0xFF
+    byte_2 = (pegs >> 16) & 0xFF
+    byte_3 = (pegs >> 24) & 0xFF
+    byte_4 =  pegs >> 32
+    return min(table_0[byte_0] | table_1[byte_1] | table_2[byte_2] |
+               table_3[byte_3] | table_4[byte_4]
+               for table_0, table_1, table_2, table_3, table_4 in SYMMETRY_TABLES)
 
 
 class Board:
     """ 
     High-level hi-q board management 
 
-    board[row][column]
+    The board is stored as a single integer bitboard, self.pegs, where bit
+    CELL_INDEX[(row, column)] is set when that position holds a peg.
+    Moves are referenced by their index into MOVES.
     Appearance of initial board:
             * * *
             * * *
@@ -72,131 +181,68 @@ class Board:
             * * *
             * * *
     """
-    def _generate_board(self):
-        self.board = []
-
-        # Initialize board with all invalid positions
-        for _ in range(BOARD_ROWS):
-            row = []
-            for _ in range(BOARD_COLUMNS):
-                row.append(PegPosition())
-            self.board.append(row)
-
-        # Configure rows [2:5]
-        for row_index in range(2,5):
-            for column_index in range(BOARD_COLUMNS):
-                self.board[row_index][column_index] = PegPosition(True)
-
-        # Configure columns [2:5]
-        for column_index in range(2,5):
-            for row_index in range(BOARD_ROWS):
-                self.board[row_index][column_index] = PegPosition(True)
+    __slots__ = ('pegs', 'num_pegs', 'moves')
 
-        # Clear middle peg
-        self.board[3][3] = PegPosition(False)
+    VALID_MASK = (1 << len(CELL_INDEX)) - 1
 
+    def _generate_board(self):
+        # Fill every valid position, then clear middle peg
+        self.pegs = Board.VALID_MASK & ~(1 << CENTER_INDEX)
 
-    def _count_pegs(self):
-        peg_count = 0
-        for row in self.board:
-            for position in row:
-                if not position.is_valid_position:
-                    continue
-                if position.peg_present:
-                    peg_count += 1
-
-        return peg_count
 
     def __init__(self):
         self._generate_board()
-        self.num_pegs = self._count_pegs()
+        self.num_pegs = self.pegs.bit_count()
         self.moves = []
 
 
     def print_board(self):
         """ print the board to the terminal """
-        for row in self.board:
-            for peg in row:
-                print(peg.as_char(), end='')
-            print()
+        pegs = self.pegs
+        for row in ROW_BITS:
+            print(''.join("  " if bit is None else " *" if pegs & bit else " O"
+                          for bit in row))
         print(f"Total pegs: {self.num_pegs}")
 
 
-    def get_peg(self, row_index: int, column_index: int) -> PegPosition:
-        """ Gets the pegPosition information for the requested indexes """
-        return self.board[row_index][column_index]
-
-
-    def _generate_jump_and_target_coords(self,
-                                         row_index: int,
-                                         column_index: int,
-                                         direction: Direction):
-        # Configure coords
-        if direction == Direction.UP:
-            jump_coords   = (row_index - 1, column_index)
-            target_coords = (row_index - 2, column_index)
-        elif direction == Direction.RIGHT:
-            jump_coords   = (row_index, column_index + 1)
-            target_coords = (row_index, column_index + 2)
-        elif direction == Direction.DOWN:
-            jump_coords   = (row_index + 1, column_index)
-            target_coords = (row_index + 2, column_index)
-        elif direction == Direction.LEFT:
-            jump_coords   = (row_index, column_index - 1)
-            target_coords = (row_index, column_index - 2)
-        else:
-            raise ValueError("Unexpected direction value")
+    def has_peg(self, row_index: int, column_index: int) -> bool:
+        """ Checks for a peg at the requested indexes - always False off the board """
+        cell_index = CELL_INDEX.get((row_index, column_index))
+        return cell_index is not None and bool(self.pegs & (1 << cell_index))
 
-        return (jump_coords, target_coords, direction)
 
-
-    def can_peg_move(self, row_index: int, column_index: int, direction: Direction) -> bool:
+    def can_peg_move(self, move_index: int) -> bool:
         """
-        Checks to see if request move is a valid one for the selected peg
-        Valid directions: 
+        Checks to see if requested move (an index into MOVES) is valid
+        for the current board
         """
-        jump_coords, target_coords, _ = \
-            self._generate_jump_and_target_coords(row_index, column_index, direction)
-
-        # Check for out of bounds
-        if target_coords[0] < 0 or \
-           target_coords[0] >= BOARD_ROWS or \
-           target_coords[1] < 0 or \
-           target_coords[1] >= BOARD_COLUMNS:
-            return False
+        need_set, need_clear, _, _, _ = MOVES[move_index]
 
-        # Verify peg exists to move
-        if not self.board[row_index][column_index].is_valid_position or \
-           not self.board[row_index][column_index].peg_present:
-            return False
+        # Peg to move and peg to jump must exist, target must be open
+        pegs = self.pegs
+        return (pegs & need_set) == need_set and not pegs & need_clear
 
-        # Verify peg exists to jump over
-        if not self.board[jump_coords[0]][jump_coords[1]].is_valid_position or \
-           not self.board[jump_coords[0]][jump_coords[1]].peg_present:
-            return False
 
-        # Verify move target is an open spot
-        if not self.board[target_coords[0]][target_coords[1]].is_valid_position or \
-           not self.board[target_coords[0]][target_coords[1]].is_empty:
-            return False
+    def make_move(self, move_index: int):
+        """
+        Handle moving and removing of pegs
+        """
+        if not self.can_peg_move(move_index):
+            raise ValueError("Not a valid move for this peg")
 
-        return True
+        self.make_move_unchecked(move_index)
 
 
-    def make_move(self, row_index: int, column_index: int, direction: Direction):
+    def make_move_unchecked(self, move_index: int):
         """
-        Handle moving and removing of pegs
+        make_move without the validity check, for callers (the solver) that
+        have already tested the move against the current board
         """
-        jump_coords, target_coords, decoded_direction = \
-            self._generate_jump_and_target_coords(row_index, column_index, direction)
-
         # Remember our move
-        self.moves.append((row_index, column_index, decoded_direction))
+        self.moves.append(move_index)
 
         # Move peg from current to 'target', remove peg we jumped
-        self.board[       row_index]    [column_index].remove_peg()
-        self.board[  jump_coords[0]][  jump_coords[1]].remove_peg()
-        self.board[target_coords[0]][target_coords[1]].add_peg()
+        self.pegs ^= MOVES[move_index][2]
 
         # Manage peg count
         self.num_pegs -= 1
@@ -207,15 +253,10 @@ class Board:
         Revert last move in move list
         """
         # Remove last move from move list
-        origin_row, origin_column, direction = self.moves.pop()
-
-        # Undo the move
-        jump_coords, target_coords, _ = \
-            self._generate_jump_and_target_coords(origin_row, origin_column, direction)
+        move_index = self.moves.pop()
 
-        self.board[      origin_row][   origin_column].add_peg()
-        self.board[  jump_coords[0]][  jump_coords[1]].add_peg()
-        self.board[target_coords[0]][target_coords[1]].remove_peg()
+        # Undo the move - toggling the same three bits restores them
+        self.pegs ^= MOVES[move_index][2]
 
         # Manage peg count
         self.num_pegs += 1
@@ -0,0 +1,185 @@
+""" Generates, builds and loads a C version of the solver search
+
+The move and symmetry tables are written into the C source as constants,
+so the compiler sees the whole search specialised to this board. Build it
+once with `python c_solver.py` (needs a C compiler on the path)
+"""
+import ctypes
+import os
+import subprocess
+
+from board_manager import MOVES, SYMMETRY_TABLES
+
+SOURCE_PATH  = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hiq_solver.c")
+LIBRARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hiq_solver.so")
+
+# A move always removes a peg, so no search goes deeper than the cell count
+MAX_DEPTH = 33
+
+SOURCE_TEMPLATE = """\
+/* Generated by c_solver.py - do not edit */
+#include <stdint.h>
+#include <string.h>
+
+#define NUM_MOVES {num_moves}
+#define MAX_DEPTH {max_depth}
+#define BLOOM_BITS ((uint64_t)1 << 27)
+
+static const uint64_t MOVE_SET[NUM_MOVES] = {{{move_set}}};
+static const uint64_t MOVE_CLEAR[NUM_MOVES] = {{{move_clear}}};
+const uint64_t hiq_move_xor[NUM_MOVES] = {{{move_xor}}};
+
+static const uint64_t SYMMETRY[8][5][256] = {{{symmetry}}};
+
+/* Dead positions - a Bloom filter, so a false positive can only prune */
+static uint8_t seen_bloom[BLOOM_BITS / 8];
+
+static uint64_t canonical_pegs(uint64_t pegs)
+{{
+    uint64_t best = pegs;
+    for (int symmetry_index = 0; symmetry_index < 8; symmetry_index++) {{
+        const uint64_t (*tables)[256] = SYMMETRY[symmetry_index];
+        uint64_t image = tables[0][ pegs        & 0xFF] |
+                         tables[1][(pegs >> 8)  & 0xFF] |
+                         tables[2][(pegs >> 16) & 0xFF] |
+                         tables[3][(pegs >> 24) & 0xFF] |
+                         tables[4][ pegs >> 32];
+        if (image < best)
+            best = image;
+    }}
+    return best;
+}}
+
+/* splitmix64 finaliser - its two 32-bit halves give the two Bloom hashes */
+static uint64_t mix(uint64_t key)
+{{
+    key = (key ^ (key >> 30)) * 0xBF58476D1CE4E5B9ULL;
+    key = (key ^ (key >> 27)) * 0x94D049BB133111EBULL;
+    return key ^ (key >> 31);
+}}
+
+static int bloom_contains(uint64_t key)
+{{
+    uint64_t hash = mix(key);
+    uint64_t bit_0 =  hash        & (BLOOM_BITS - 1);
+    uint64_t bit_1 = (hash >> 32) & (BLOOM_BITS - 1);
+    return (seen_bloom[bit_0 >> 3] >> (bit_0 & 7)) & (seen_bloom[bit_1 >> 3] >> (bit_1 & 7)) & 1;
+}}
+
+static void bloom_add(uint64_t key)
+{{
+    uint64_t hash = mix(key);
+    uint64_t bit_0 =  hash        & (BLOOM_BITS - 1);
+    uint64_t bit_1 = (hash >> 32) & (BLOOM_BITS - 1);
+    seen_bloom[bit_0 >> 3] |= (uint8_t)(1 << (bit_0 & 7));
+    seen_bloom[bit_1 >> 3] |= (uint8_t)(1 << (bit_1 & 7));
+}}
+
+/* Fills out_moves (MAX_DEPTH entries) and returns how many, or -1 */
+int hiq_solve(uint64_t pegs, int8_t *out_moves)
+{{
+    int16_t stack[MAX_DEPTH + 1];
+    int depth = 0;
+    int num_pegs = __builtin_popcountll(pegs);
+
+    memset(seen_bloom, 0, sizeof(seen_bloom));
+
+    stack[0] = 0;
+    while (num_pegs != 1) {{
+        int move_index = stack[depth];
+        uint64_t next_pegs = 0;
+        int found = 0;
+        for (; move_index < NUM_MOVES; move_index++) {{
+            if (((pegs & MOVE_SET[move_index]) == MOVE_SET[move_index]) &
+                ((pegs & MOVE_CLEAR[move_index]) == 0)) {{
+                next_pegs = pegs ^ hiq_move_xor[move_index];
+                if (!bloom_contains(canonical_pegs(next_pegs))) {{
+                    found = 1;
+                    break;
+                }}
+            }}
+        }}
+
+        if (!found) {{
+            /* Every move from here has been tried - remember this position is dead */
+            bloom_add(canonical_pegs(pegs));
+            if (depth == 0)
+                return -1;
+            depth--;
+            pegs ^= hiq_move_xor[out_moves[depth]];
+            num_pegs++;
+            continue;
+        }}
+
+        /* Resume after this move when we come back, start the next depth fresh */
+        stack[depth] = (int16_t)(move_index + 1);
+        out_moves[depth] = (int8_t)move_index;
+        pegs = next_pegs;
+        num_pegs--;
+        depth++;
+        stack[depth] = 0;
+    }}
+
+    return depth;
+}}
+"""
+
+
+def _format_constants(values) -> str:
+    return ", ".join(f"{value:#x}ULL" for value in values)
+
+
+def generate_source() -> str:
+    """ C source for the search, with the current MOVES and SYMMETRY_TABLES baked in """
+    symmetry = ",\n".join(
+        "{" + ", ".join("{" + _format_constants(table) + "}" for table in byte_tables) + "}"
+        for byte_tables in SYMMETRY_TABLES)
+    return SOURCE_TEMPLATE.format(
+        num_moves=len(MOVES),
+        max_depth=MAX_DEPTH,
+        move_set=_format_constants(move[0] for move in MOVES),
+        move_clear=_format_constants(move[1] for move in MOVES),
+        move_xor=_format_constants(move[2] for move in MOVES),
+        symmetry=symmetry)
+
+
+def build(compiler: str="cc"):
+    """ Write the generated source and compile it into LIBRARY_PATH """
+    with open(SOURCE_PATH, "w") as source_file:
+        source_file.write(generate_source())
+    subprocess.run([compiler, "-O2", "-shared", "-fPIC", "-o", LIBRARY_PATH, SOURCE_PATH],
+                   check=True)
+
+
+def _load_library():
+    try:
+        library = ctypes.CDLL(LIBRARY_PATH)
+    except OSError as error:
+        raise ImportError(f"{LIBRARY_PATH} is not built - run python c_solver.py") from error
+
+    # The tables are compiled in, so a library built from an older MOVES is unusable
+    move_xor = (ctypes.c_uint64 * len(MOVES)).in_dll(library, "hiq_move_xor")
+    if list(move_xor) != [move[2] for move in MOVES]:
+        raise ImportError(f"{LIBRARY_PATH} is out of date - run python c_solver.py")
+
+    library.hiq_solve.argtypes = [ctypes.c_uint64, ctypes.POINTER(ctypes.c_int8)]
+    library.hiq_solve.restype = ctypes.c_int
+    return library
+
+
+def solve(pegs: int):
+    """
+    Search from the bitboard pegs for moves that leave a single peg.
+    Returns the list of indexes into MOVES, or None if there is no solution
+    """
+    solution = (ctypes.c_int8 * MAX_DEPTH)()
+    num_solution_moves = _library.hiq_solve(pegs, solution)
+    if num_solution_moves < 0:
+        return None
+    return list(solution[:num_solution_moves])
+
+
+if __name__ == "__main__":
+    build()
+else:
+    _library = _load_library()
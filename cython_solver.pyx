@@ -0,0 +1,103 @@
+# distutils: language = c++
+# cython: boundscheck=False, wraparound=False, cdivision=True
+""" Cython-compiled version of the solver search - build with setup.py """
+from libc.stdint cimport uint64_t
+from libcpp.unordered_set cimport unordered_set
+
+from board_manager import MOVES, SYMMETRY_TABLES
+
+assert len(MOVES) == 76, "NUM_MOVES must match board_manager.MOVES"
+
+cdef enum:
+    NUM_MOVES = 76
+    NUM_SYMMETRIES = 8
+    # A move always removes a peg, so no search goes deeper than the cell count
+    MAX_DEPTH = 33
+
+# MOVES and SYMMETRY_TABLES copied into C arrays at import
+cdef uint64_t moves_set[NUM_MOVES]
+cdef uint64_t moves_clear[NUM_MOVES]
+cdef uint64_t moves_xor[NUM_MOVES]
+cdef uint64_t symmetry_tables[NUM_SYMMETRIES][5][256]
+
+for _move_index, (_need_set, _need_clear, _xor_mask, _, _) in enumerate(MOVES):
+    moves_set[_move_index]   = _need_set
+    moves_clear[_move_index] = _need_clear
+    moves_xor[_move_index]   = _xor_mask
+
+for _symmetry_index, _byte_tables in enumerate(SYMMETRY_TABLES):
+    for _byte_index, _table in enumerate(_byte_tables):
+        for _value, _image in enumerate(_table):
+            symmetry_tables[_symmetry_index][_byte_index][_value] = _image
+
+
+cdef inline uint64_t _canonical_pegs(uint64_t pegs) nogil:
+    cdef uint64_t best = pegs
+    cdef uint64_t image
+    cdef int symmetry_index
+    for symmetry_index in range(NUM_SYMMETRIES):
+        image = symmetry_tables[symmetry_index][0][ pegs        & 0xFF] | \
+                symmetry_tables[symmetry_index][1][(pegs >> 8)  & 0xFF] | \
+                symmetry_tables[symmetry_index][2][(pegs >> 16) & 0xFF] | \
+                symmetry_tables[symmetry_index][3][(pegs >> 24) & 0xFF] | \
+                symmetry_tables[symmetry_index][4][ pegs >> 32]
+        if image < best:
+            best = image
+    return best
+
+
+cpdef object solve(uint64_t pegs):
+    """
+    Search from the bitboard pegs for moves that leave a single peg.
+    Returns the list of indexes into MOVES, or None if there is no solution
+    """
+    cdef unordered_set[uint64_t] seen
+    # Indexes into MOVES fit in a byte, so both stacks stay tiny
+    cdef short stack[MAX_DEPTH]
+    cdef signed char solution[MAX_DEPTH]
+    cdef int depth = 0
+    cdef int num_pegs = 0
+    cdef int move_index, last_move
+    cdef uint64_t remaining = pegs
+    cdef uint64_t next_pegs = 0
+    cdef bint found
+
+    while remaining:
+        remaining &= remaining - 1
+        num_pegs += 1
+
+    # Index of the next move to try at each depth of the search
+    stack[0] = 0
+    while num_pegs != 1:
+        move_index = stack[depth]
+        found = False
+        while move_index < NUM_MOVES:
+            move_index += 1
+            # Branchless legality test: & rather than short-circuiting and
+            if ((pegs & moves_set[move_index - 1]) == moves_set[move_index - 1]) & \
+               ((pegs & moves_clear[move_index - 1]) == 0):
+                next_pegs = pegs ^ moves_xor[move_index - 1]
+                if seen.count(_canonical_pegs(next_pegs)) == 0:
+                    found = True
+                    break
+
+        if not found:
+            # Every move from here has been tried - remember this position is dead
+            seen.insert(_canonical_pegs(pegs))
+            if depth == 0:
+                return None
+            depth -= 1
+            last_move = solution[depth]
+            pegs ^= moves_xor[last_move]
+            num_pegs += 1
+            continue
+
+        # Resume after this move when we come back, start the next depth fresh
+        stack[depth] = move_index
+        solution[depth] = move_index - 1
+        pegs = next_pegs
+        num_pegs -= 1
+        depth += 1
+        stack[depth] = 0
+
+    return [solution[move_index] for move_index in range(depth)]
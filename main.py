@@ -1,5 +1,14 @@
 """ Solver for hi-q board game """
-from board_manager import Board, Direction
+from board_manager import Board, Direction, describe_move, find_move
+from solver import get_any_solution
+
+def format_moves(moves) -> list:
+    """ Readable (row, column, direction name) for each index into MOVES """
+    formatted = []
+    for move_index in moves:
+        row_index, column_index, direction = describe_move(move_index)
+        formatted.append((row_index, column_index, Direction.NAMES[direction]))
+    return formatted
 
 def main():
     """ Top-level solver method """
@@ -7,11 +16,17 @@ def main():
     b = Board()
     b.print_board()
 
-    b.make_move(1, 3, Direction.DOWN)
+    b.make_move(find_move(1, 3, Direction.DOWN))
     b.print_board()
-    print(f"Moves: {b.moves}")
+    print(f"Moves: {format_moves(b.moves)}")
     b.undo_last_move()
     b.print_board()
 
+    if get_any_solution(b):
+        print(f"Solution: {format_moves(b.moves)}")
+        b.print_board()
+    else:
+        print("No solution found")
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,130 @@
+""" Numba-compiled version of the solver search - requires numpy and numba """
+import numpy as np
+from numba import njit
+
+from board_manager import MOVES, SYMMETRY_TABLES
+
+# MOVES and SYMMETRY_TABLES as arrays that compiled code can index.
+# Bitboards only use 33 bits, so int64 holds them without mixing signedness
+MOVES_SET   = np.array([move[0] for move in MOVES], dtype=np.int64)
+MOVES_CLEAR = np.array([move[1] for move in MOVES], dtype=np.int64)
+MOVES_XOR   = np.array([move[2] for move in MOVES], dtype=np.int64)
+SYMMETRY_ARRAY = np.array(SYMMETRY_TABLES, dtype=np.int64)
+
+# Dead positions go in a Bloom filter of BLOOM_BITS bits (64 MiB) probed at
+# BLOOM_HASHES places - far cheaper to probe than a typed set. A false
+# positive only prunes a live subtree, so the search still returns a valid
+# solution, it may just miss one on a board with very few
+BLOOM_BITS   = 1 << 29
+BLOOM_HASHES = 6
+
+
+@njit(cache=True)
+def _canonical_pegs(pegs, symmetry_array):
+    best = pegs
+    for symmetry_index in range(symmetry_array.shape[0]):
+        tables = symmetry_array[symmetry_index]
+        image = tables[0,  pegs        & 0xFF] | \
+                tables[1, (pegs >> 8)  & 0xFF] | \
+                tables[2, (pegs >> 16) & 0xFF] | \
+                tables[3, (pegs >> 24) & 0xFF] | \
+                tables[4,  pegs >> 32]
+        if image < best:
+            best = image
+    return best
+
+
+@njit(cache=True)
+def _bloom_hashes(key):
+    """ Base hash and odd step (from a splitmix64 mix of key) for double hashing """
+    hash_value = np.uint64(key)
+    hash_value = (hash_value ^ (hash_value >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    hash_value = (hash_value ^ (hash_value >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    hash_value = hash_value ^ (hash_value >> np.uint64(31))
+    return hash_value, (hash_value >> np.uint64(32)) | np.uint64(1)
+
+
+@njit(cache=True)
+def _bloom_contains(bloom, key):
+    hash_0, hash_1 = _bloom_hashes(key)
+    bit_mask = np.uint64(bloom.shape[0] * 8 - 1)
+    for hash_index in range(BLOOM_HASHES):
+        bit = (hash_0 + np.uint64(hash_index) * hash_1) & bit_mask
+        if not bloom[bit >> np.uint64(3)] & np.uint8(1 << int(bit & np.uint64(7))):
+            return False
+    return True
+
+
+@njit(cache=True)
+def _bloom_add(bloom, key):
+    hash_0, hash_1 = _bloom_hashes(key)
+    bit_mask = np.uint64(bloom.shape[0] * 8 - 1)
+    for hash_index in range(BLOOM_HASHES):
+        bit = (hash_0 + np.uint64(hash_index) * hash_1) & bit_mask
+        bloom[bit >> np.uint64(3)] |= np.uint8(1 << int(bit & np.uint64(7)))
+
+
+@njit(cache=True)
+def _solve(pegs, moves_set, moves_clear, moves_xor, symmetry_array, bloom, solution):
+    """
+    Same explicit-stack search as solver.get_any_solution. Fills solution
+    with the chosen move indexes and returns how many, or -1 if unsolvable
+    """
+    num_moves = moves_set.shape[0]
+    num_pegs = 0
+    remaining = pegs
+    while remaining:
+        remaining &= remaining - 1
+        num_pegs += 1
+
+    # Index of the next move to try at each depth of the search - like
+    # solution, a small fixed array so the search loop never allocates
+    stack = np.zeros(solution.shape[0] + 1, dtype=np.int16)
+    depth = 0
+    while num_pegs != 1:
+        move_index = stack[depth]
+        found = False
+        while move_index < num_moves:
+            need_set = moves_set[move_index]
+            move_index += 1
+            if ((pegs & need_set) == need_set) & ((pegs & moves_clear[move_index - 1]) == 0):
+                next_pegs = pegs ^ moves_xor[move_index - 1]
+                if not _bloom_contains(bloom, _canonical_pegs(next_pegs, symmetry_array)):
+                    found = True
+                    break
+
+        if not found:
+            # Every move from here has been tried - remember this position is dead
+            _bloom_add(bloom, _canonical_pegs(pegs, symmetry_array))
+            if depth == 0:
+                return -1
+            depth -= 1
+            last_move = solution[depth]
+            pegs ^= moves_xor[last_move]
+            num_pegs += 1
+            continue
+
+        # Resume after this move when we come back, start the next depth fresh
+        stack[depth] = move_index
+        solution[depth] = move_index - 1
+        pegs = next_pegs
+        num_pegs -= 1
+        depth += 1
+        stack[depth] = 0
+
+    return depth
+
+
+def solve(pegs: int):
+    """
+    Search from the bitboard pegs for moves that leave a single peg.
+    Returns the list of indexes into MOVES, or None if there is no solution
+    """
+    # Indexes into MOVES fit in a byte - the whole solution is one cache line
+    solution = np.zeros(max(pegs.bit_count() - 1, 0), dtype=np.int8)
+    num_solution_moves = _solve(np.int64(pegs), MOVES_SET, MOVES_CLEAR, MOVES_XOR,
+                                SYMMETRY_ARRAY, np.zeros(BLOOM_BITS // 8, dtype=np.uint8),
+                                solution)
+    if num_solution_moves < 0:
+        return None
+    return [int(move_index) for move_index in solution[:num_solution_moves]]
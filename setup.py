@@ -0,0 +1,8 @@
+""" Builds the optional Cython solver: python setup.py build_ext --inplace """
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="hi_q_solver",
+    ext_modules=cythonize("cython_solver.pyx", language_level=3),
+)
@@ -0,0 +1,89 @@
+""" Searches a board for a sequence of moves that solves it """
+import importlib
+
+from board_manager import Board, MOVES, canonical_pegs
+
+# Compiled searches, fastest first: the generated C library (built by
+# c_solver.py), the Cython extension (built by setup.py), then the numba one
+# (needs numpy and numba). Without any of them, use pure Python
+compiled_solver = None
+for _module_name in ("c_solver", "cython_solver", "numba_solver"):
+    try:
+        compiled_solver = importlib.import_module(_module_name)
+        break
+    except ImportError:
+        continue
+
+
+def get_any_solution(board: Board, verbose: bool=False) -> bool:
+    """
+    Depth-first search for any sequence of moves that leaves a single peg.
+    On success the solution is left applied in board.moves
+
+    verbose reports progress before and after the search - nothing is
+    printed from inside the search loop
+    """
+    start_depth = len(board.moves)
+    if verbose:
+        backend = "pure Python" if compiled_solver is None else compiled_solver.__name__
+        print(f"Searching from {board.num_pegs} pegs with the {backend} solver")
+
+    if compiled_solver is None:
+        solved = _search(board)
+    else:
+        solution = compiled_solver.solve(board.pegs)
+        solved = solution is not None
+        for move_index in solution or ():
+            board.make_move(move_index)
+
+    if verbose:
+        if solved:
+            print(f"Found a solution in {len(board.moves) - start_depth} moves")
+        else:
+            print("Search exhausted without a solution")
+    return solved
+
+
+def _search(board: Board) -> bool:
+    """
+    Pure Python explicit-stack search.
+    Positions proven to have no solution are kept in a set of bitboards, so
+    reaching one again through a different move order is pruned at once.
+    Each position is stored in canonical form, so its rotations and
+    reflections are pruned along with it
+    """
+    seen = set()
+    num_moves = len(MOVES)
+
+    # Bind everything the loop touches to locals once
+    moves = MOVES
+    canonical = canonical_pegs
+    make_move = board.make_move_unchecked
+    undo_last_move = board.undo_last_move
+
+    # Index of the next move to try at each depth of the search
+    stack = [0]
+    while board.num_pegs != 1:
+        pegs = board.pegs
+        move_index = stack[-1]
+        while move_index < num_moves:
+            need_set, need_clear, xor_mask, _, _ = moves[move_index]
+            move_index += 1
+            if (pegs & need_set) == need_set and not pegs & need_clear:
+                if canonical(pegs ^ xor_mask) not in seen:
+                    make_move(move_index - 1)
+                    break
+        else:
+            # Every move from here has been tried - remember this position is dead
+            seen.add(canonical(pegs))
+            stack.pop()
+            if not stack:
+                return False
+            undo_last_move()
+            continue
+
+        # Resume after this move when we come back, start the next depth fresh
+        stack[-1] = move_index
+        stack.append(0)
+
+    return True